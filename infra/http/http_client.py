@@ -5,6 +5,10 @@ import time
 import requests
 from requests import Response
 
+# Only transport-level failures are worth retrying; HTTP errors raised by
+# raise_for_status() (e.g. a 404) surface immediately.
+RETRYABLE_EXCEPTIONS = (requests.ConnectionError, requests.Timeout)
+
 
 class BaseSession:
     """Reusable HTTP client with retry logic and structured logging."""
@@ -16,12 +20,13 @@ class BaseSession:
         max_retries: int = 3,
         retry_statuses: Iterable[int] = (502, 503, 504),
         logger: Optional[logging.Logger] = None,
+        session: Optional[requests.Session] = None,
     ) -> None:
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
         self.max_retries = max_retries
         self.retry_statuses = set(retry_statuses)
-        self.session = requests.Session()
+        self.session = session or requests.Session()
         self.log = logger or logging.getLogger(self.__class__.__name__)
 
     def _request(self, method: str, path: str, **kwargs) -> Response:
@@ -42,7 +47,7 @@ class BaseSession:
                 response.raise_for_status()
                 return response
 
-            except requests.RequestException as exc:
+            except RETRYABLE_EXCEPTIONS as exc:
                 last_exc = exc
                 if attempt == self.max_retries:
                     raise
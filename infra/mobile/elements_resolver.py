@@ -1,13 +1,26 @@
 # infra/mobile/elements_resolver.py
 from infra.mobile.mobile_elements import MOBILE_ELEMENTS
 
+def _flatten_by_platform() -> dict[str, dict[str, str]]:
+    """Invert MOBILE_ELEMENTS into platform -> {logical_name: locator}."""
+    by_platform: dict[str, dict[str, str]] = {}
+    for name, locators in MOBILE_ELEMENTS.items():
+        for platform, locator in locators.items():
+            by_platform.setdefault(platform, {})[name] = locator
+    return by_platform
+
+
+# Flattened once at import
+_LOCATORS_BY_PLATFORM = _flatten_by_platform()
+
 
 class ElementResolver:
     def __init__(self, platform: str):
         self.platform = platform
+        self._locators = _LOCATORS_BY_PLATFORM.get(platform, {})
 
     def locator(self, logical_name: str) -> str:
         try:
-            return MOBILE_ELEMENTS[logical_name][self.platform]
+            return self._locators[logical_name]
         except KeyError:
             raise KeyError(f"Unknown locator '{logical_name}' for platform '{self.platform}'")
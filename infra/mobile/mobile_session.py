@@ -24,6 +24,13 @@ class MobileSession:
         self.app_launched = True
         self.current_screen = "welcome"
 
+    def reset(self) -> None:
+        """Return to the welcome screen, logged out, without relaunching."""
+        logger.info("Resetting session")
+        self.logged_in = False
+        self.live_stream_active = False
+        self.current_screen = "welcome"
+
     def close(self) -> None:
         logger.info("Closing session")
         self.app_launched = False
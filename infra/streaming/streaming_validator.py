@@ -15,9 +15,17 @@ NetworkCondition = Literal["normal", "poor", "terrible"]
 class StreamingValidator(BaseSession):
     """Validator for the real mock streaming service."""
 
-    def __init__(self, config: StreamingConfig | None = None) -> None:
+    def __init__(
+        self,
+        config: StreamingConfig | None = None,
+        session: requests.Session | None = None,
+    ) -> None:
         self.config = config or StreamingConfig()
-        super().__init__(base_url=self.config.base_url, timeout=self.config.timeout)
+        super().__init__(
+            base_url=self.config.base_url,
+            timeout=self.config.timeout,
+            session=session,
+        )
 
         # Kept for backward compatibility with older tests
         self.fast_mode: bool = False
@@ -35,7 +43,8 @@ class StreamingValidator(BaseSession):
 
         return float(health["latency_ms"])
 
-    def set_network_condition(self, condition: NetworkCondition) -> None:
+    def set_network_condition(self, condition: NetworkCondition) -> int:
+        """Switch the network profile and return the bitrate it applied."""
         if condition not in ("normal", "poor", "terrible"):
             raise ValueError("Unsupported network condition")
 
@@ -47,6 +56,8 @@ class StreamingValidator(BaseSession):
             resp = self._post("/control/network/", json={"condition": condition})
             resp.raise_for_status()
 
+        return int(resp.json()["bitrate"])
+
     def get_manifest(self) -> str:
         resp = self._get("/stream.m3u8")
         resp.raise_for_status()
@@ -1,19 +1,27 @@
 
 from __future__ import annotations
 
+if __name__ == "__main__":
+    # Patch before the stdlib/flask imports so time.sleep() in
+    # apply_network_delay() yields to other greenlets instead of blocking.
+    try:
+        from gevent import monkey
+    except ImportError:  # fall back to Werkzeug's threaded dev server
+        monkey = None
+    else:
+        monkey.patch_all()
+
+import hashlib
+import os
 import random
 import time
+from typing import NamedTuple
 
+import orjson
 from flask import Flask, jsonify, request, Response, make_response
 
 app = Flask(__name__)
 
-STATE = {
-    "network_condition": "normal",
-    "viewers": 0,
-    "bitrate": 2500,
-}
-
 NETWORK_PROFILES = {
     "normal": {
         "bitrate": 2500,
@@ -32,38 +40,25 @@ NETWORK_PROFILES = {
     },
 }
 
+# MOCK_FAST=1 scales every profile by 1/1000 so CI keeps the
+# normal < poor < terrible ordering without paying real sleeps.
+FAST = os.environ.get("MOCK_FAST") == "1"
+if FAST:
+    for _profile in NETWORK_PROFILES.values():
+        _profile["latency"] *= 0.001
+        _profile["jitter"] *= 0.001
 
-def apply_network_delay() -> None:
-    """Apply realistic delay based on the current network profile."""
-    profile = NETWORK_PROFILES[STATE["network_condition"]]
-    base = profile["latency"]
-    jitter = random.uniform(-profile["jitter"], profile["jitter"])
-    delay = max(0, base + jitter)
-    time.sleep(delay)
-
+# Sub-millisecond sleeps round to nothing on most schedulers.
+_MIN_SLEEP = 0.001
 
-@app.route("/health", methods=["GET"])
-def health() -> Response:
-    """Health check endpoint returning basic streaming metrics."""
-    apply_network_delay()
-    profile = NETWORK_PROFILES[STATE["network_condition"]]
+# True when no profile can ever reach _MIN_SLEEP (e.g. under MOCK_FAST), in
+# which case apply_network_delay is bound to a no-op below.
+_NO_DELAY = all(
+    profile["latency"] + profile["jitter"] < _MIN_SLEEP
+    for profile in NETWORK_PROFILES.values()
+)
 
-    return jsonify(
-        {
-            "status": "healthy",
-            "bitrate": STATE["bitrate"],
-            "viewers": STATE["viewers"],
-            "latency_ms": profile["latency"] * 1000,
-            "network_condition": STATE["network_condition"],
-        },
-    )
-
-
-@app.route("/stream.m3u8", methods=["GET"])
-def stream_manifest() -> Response:
-    """Return a simple HLS manifest."""
-    apply_network_delay()
-    manifest = """#EXTM3U
+_MANIFEST = b"""#EXTM3U
 #EXT-X-VERSION:3
 #EXT-X-TARGETDURATION:10
 #EXT-X-MEDIA-SEQUENCE:0
@@ -79,24 +74,155 @@ segment4.ts
 segment5.ts
 #EXT-X-ENDLIST
 """
-    return Response(manifest, mimetype="application/vnd.apple.mpegurl")
+# Passed as an iterable: a bytes body would go through set_data(), which
+# recomputes Content-Length and ignores direct_passthrough
+_MANIFEST_BODY = (_MANIFEST,)
+_MANIFEST_ETAG = hashlib.md5(_MANIFEST).hexdigest()
+_MANIFEST_CACHE_HEADERS = {
+    "ETag": f'"{_MANIFEST_ETAG}"',
+    "Cache-Control": "no-cache",
+}
+_MANIFEST_HEADERS = {
+    "Content-Length": str(len(_MANIFEST)),
+    **_MANIFEST_CACHE_HEADERS,
+}
 
+_DUMMY_SEGMENT = b"\x00" * (100 * 1024)
+# Written in slices so a gevent server can switch greenlets between writes
+_SEGMENT_CHUNK_SIZE = 16 * 1024
+_SEGMENT_CHUNKS = tuple(
+    _DUMMY_SEGMENT[offset:offset + _SEGMENT_CHUNK_SIZE]
+    for offset in range(0, len(_DUMMY_SEGMENT), _SEGMENT_CHUNK_SIZE)
+)
+_SEGMENT_ETAG = hashlib.md5(_DUMMY_SEGMENT).hexdigest()
+_SEGMENT_CACHE_HEADERS = {
+    "ETag": f'"{_SEGMENT_ETAG}"',
+    "Cache-Control": "public, max-age=10",
+}
+_SEGMENT_HEADERS = {
+    "Content-Length": str(len(_DUMMY_SEGMENT)),
+    **_SEGMENT_CACHE_HEADERS,
+}
+
+_random = random.random
+_sleep = time.sleep
+
+VIEWERS = 0
+
+
+class ActiveProfile(NamedTuple):
+    """Flattened view of the current network profile."""
+
+    condition: str
+    bitrate: int
+    latency: float
+    jitter: float
+    jitter_span: float  # 2 * jitter, precomputed for apply_network_delay
+
+
+def _profile_snapshot(condition: str) -> ActiveProfile:
+    profile = NETWORK_PROFILES[condition]
+    jitter = profile["jitter"]
+    return ActiveProfile(
+        condition=condition,
+        bitrate=profile["bitrate"],
+        latency=profile["latency"],
+        jitter=jitter,
+        jitter_span=2 * jitter,
+    )
 
-@app.route("/segment<int:num>.ts", methods=["GET"])
-def segment(num: int) -> Response:
-    """Return a simulated TS segment by index (1-5)."""
-    if num < 1 or num > 5:
-        error_body = jsonify({"error": "Segment not found"})
-        return make_response(error_body, 404)
 
+# Swapped as a whole on every condition change, so concurrent readers always
+# see a consistent profile without taking a lock.
+_active = _profile_snapshot("normal")
+
+
+if _NO_DELAY:
+    def apply_network_delay() -> None:
+        """No-op: every profile's maximum delay is below _MIN_SLEEP."""
+else:
+    def apply_network_delay() -> None:
+        """Apply realistic delay based on the current network profile."""
+        profile = _active
+        if profile.jitter:
+            delay = profile.latency + _random() * profile.jitter_span - profile.jitter
+        else:
+            delay = profile.latency
+        if delay >= _MIN_SLEEP:
+            _sleep(delay)
+
+
+@app.route("/health", methods=["GET"])
+def health() -> Response:
+    """Health check endpoint returning basic streaming metrics."""
     apply_network_delay()
-    dummy_data = b"\x00" * (100 * 1024)
-    return Response(dummy_data, mimetype="video/MP2T")
+    profile = _active
+
+    body = orjson.dumps(
+        {
+            "status": "healthy",
+            "bitrate": profile.bitrate,
+            "viewers": VIEWERS,
+            "latency_ms": profile.latency * 1000,
+            "network_condition": profile.condition,
+        },
+    )
+    return Response(body, mimetype="application/json")
+
+
+@app.route("/stream.m3u8", methods=["GET"])
+def stream_manifest() -> Response:
+    """Return a simple HLS manifest."""
+    # Revalidation is answered before the simulated delay
+    if request.if_none_match.contains_weak(_MANIFEST_ETAG):
+        return Response(status=304, headers=_MANIFEST_CACHE_HEADERS)
+
+    apply_network_delay()
+    return Response(
+        _MANIFEST_BODY,
+        mimetype="application/vnd.apple.mpegurl",
+        headers=_MANIFEST_HEADERS,
+        direct_passthrough=True,
+    )
+
+
+def segment() -> Response:
+    """Return a simulated TS segment (registered for /segment1-5.ts)."""
+    if request.if_none_match.contains_weak(_SEGMENT_ETAG):
+        return Response(status=304, headers=_SEGMENT_CACHE_HEADERS)
+
+    apply_network_delay()
+    return Response(
+        _SEGMENT_CHUNKS,
+        mimetype="video/MP2T",
+        headers=_SEGMENT_HEADERS,
+        direct_passthrough=True,
+    )
+
+
+# Static rules for the five valid segments are dispatched without running the
+# int converter; anything else falls through to segment_not_found below.
+for _index in range(1, 6):
+    app.add_url_rule(
+        f"/segment{_index}.ts",
+        endpoint=f"segment{_index}",
+        view_func=segment,
+        methods=["GET"],
+    )
+
+
+@app.route("/segment<int:num>.ts", methods=["GET"])
+def segment_not_found(num: int) -> Response:
+    """Reject segment indexes outside 1-5."""
+    error_body = jsonify({"error": "Segment not found"})
+    return make_response(error_body, 404)
 
 
 @app.route("/control/network/<condition>", methods=["POST"])
 def control_network_path(condition: str) -> Response:
     """Set network condition via path (/control/network/poor)."""
+    global _active
+
     if condition not in NETWORK_PROFILES:
         resp = jsonify(
             {
@@ -107,14 +233,14 @@ def control_network_path(condition: str) -> Response:
         resp.status_code = 400
         return resp
 
-    STATE["network_condition"] = condition
-    STATE["bitrate"] = NETWORK_PROFILES[condition]["bitrate"]
+    profile = _profile_snapshot(condition)
+    _active = profile
 
     return jsonify(
         {
             "status": "success",
             "network_condition": condition,
-            "bitrate": STATE["bitrate"],
+            "bitrate": profile.bitrate,
         },
     )
 
@@ -122,8 +248,13 @@ def control_network_path(condition: str) -> Response:
 @app.route("/control/network/", methods=["POST"])
 def control_network_json() -> Response:
     """Set network condition via JSON payload: {'condition': 'poor'}."""
-    data = request.get_json() or {}
-    condition = data.get("condition")
+    try:
+        data = orjson.loads(request.get_data() or b"{}")
+    except orjson.JSONDecodeError:
+        data = {}
+    condition = data.get("condition") if isinstance(data, dict) else None
+    if not isinstance(condition, str):
+        condition = None
 
     if condition not in NETWORK_PROFILES:
         resp = jsonify(
@@ -139,7 +270,8 @@ def control_network_json() -> Response:
 
 
 if __name__ == "__main__":
-    print("Mock streaming server starting on http://localhost:8082\n")
+    port = int(os.environ.get("MOCK_STREAM_PORT", "8082"))
+    print(f"Mock streaming server starting on http://localhost:{port}\n")
     print("Endpoints:")
     print("  GET  /health")
     print("  GET  /stream.m3u8")
@@ -148,4 +280,9 @@ if __name__ == "__main__":
     print("  POST /control/network/")
     print("\nNetwork conditions: normal, poor, terrible\n")
 
-    app.run(host="0.0.0.0", port=8082, debug=False)
\ No newline at end of file
+    if monkey is not None:
+        from gevent.pywsgi import WSGIServer
+
+        WSGIServer(("0.0.0.0", port), app).serve_forever()
+    else:
+        app.run(host="0.0.0.0", port=port, debug=False, threaded=True)
\ No newline at end of file
@@ -1,7 +1,16 @@
-import logging
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
 import pytest
+import requests
+from requests.adapters import HTTPAdapter
 
 from config.config import StreamingConfig, MobileTestConfig
+from infra.logging_setup import init_logging
 from infra.streaming.streaming_validator import StreamingValidator
 from infra.mobile.mobile_session import MobileSession
 
@@ -11,12 +20,15 @@ from infra.mobile.screens.live_stream_screen import LiveStreamScreen
 
 from typing import Generator
 
+MOCK_SERVER_SCRIPT = (
+    Path(__file__).resolve().parents[1] / "mock_services" / "mock_stream_server.py"
+)
+
 
 def pytest_configure(config) -> None:
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-    )
+    os.environ.setdefault("MOCK_FAST", "1")
+
+    init_logging(level=os.environ.get("TEST_LOG_LEVEL", "WARNING").upper())
 
     metadata = getattr(config, "metadata", None)
     if metadata:
@@ -25,14 +37,77 @@ def pytest_configure(config) -> None:
                 "Project": "Nanit Home Assignment",
                 "Executor": "Pytest",
                 "Environment": "Local",
-                "StreamingBackend": "http://localhost:8082",
             }
         )
 
 
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for_health(
+    url: str, proc: subprocess.Popen, log_path: Path, timeout: float = 10.0
+) -> None:
+    deadline = time.monotonic() + timeout
+    delay = 0.05
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(
+                f"Mock streaming server exited early (code {proc.returncode}):\n"
+                f"{log_path.read_text(errors='replace')}"
+            )
+        try:
+            if requests.get(url, timeout=1).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(delay)
+        delay = min(delay * 2, 0.5)
+
+    raise RuntimeError(f"Mock streaming server not healthy at {url}")
+
+
+@pytest.fixture(scope="session")
+def streaming_server_url(
+    tmp_path_factory: pytest.TempPathFactory,
+) -> Generator[str, None, None]:
+    """Spawn the mock server once, unless STREAMING_BASE_URL points at one."""
+    external = os.environ.get("STREAMING_BASE_URL")
+    if external:
+        yield external
+        return
+
+    # A free port per session gives every xdist worker a private server, so
+    # one worker switching the network condition can't affect another
+    port = _free_port()
+    # The server's banner and per-request access log go to a file rather
+    # than the test's captured output; it is surfaced if startup fails
+    log_path = tmp_path_factory.mktemp("mock_stream_server") / "server.log"
+    with log_path.open("wb") as log_file:
+        proc = subprocess.Popen(
+            [sys.executable, str(MOCK_SERVER_SCRIPT)],
+            env={**os.environ, "MOCK_STREAM_PORT": str(port)},
+            stdout=log_file,
+            stderr=subprocess.STDOUT,
+        )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        _wait_for_health(f"{base_url}/health", proc, log_path)
+        yield base_url
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+
+
 @pytest.fixture(scope="session")
-def streaming_config() -> StreamingConfig:
-    return StreamingConfig()
+def streaming_config(streaming_server_url: str) -> StreamingConfig:
+    return StreamingConfig(base_url=streaming_server_url)
 
 
 @pytest.fixture(scope="session")
@@ -40,14 +115,41 @@ def mobile_config() -> MobileTestConfig:
     return MobileTestConfig()
 
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="session")
+def http_session() -> Generator[requests.Session, None, None]:
+    """Keep-alive connection pool shared by every streaming test."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10, max_retries=0)
+    session.mount("http://", adapter)
+    yield session
+    session.close()
+
+
+@pytest.fixture(scope="session")
 def streaming_validator(
     streaming_config: StreamingConfig,
+    http_session: requests.Session,
 ) -> StreamingValidator:
-    return StreamingValidator(config=streaming_config)
+    return StreamingValidator(config=streaming_config, session=http_session)
 
 
-@pytest.fixture(scope="function")
+@pytest.fixture
+def normal_network(streaming_validator: StreamingValidator) -> None:
+    """Start the test from the normal network profile."""
+    streaming_validator.set_network_condition("normal")
+
+
+@pytest.fixture
+def network_condition(
+    request: pytest.FixtureRequest,
+    streaming_validator: StreamingValidator,
+) -> str:
+    """Apply the indirectly parametrized network condition."""
+    streaming_validator.set_network_condition(request.param)
+    return request.param
+
+
+@pytest.fixture(scope="session")
 def mobile_session(
     mobile_config: MobileTestConfig,
 ) -> Generator[MobileSession, None, None]:
@@ -57,6 +159,13 @@ def mobile_session(
     session.close()
 
 
+@pytest.fixture(autouse=True)
+def mobile_session_reset(request: pytest.FixtureRequest) -> None:
+    """Put the shared session back on the welcome screen before each test."""
+    if "mobile_session" in request.fixturenames:
+        request.getfixturevalue("mobile_session").reset()
+
+
 @pytest.fixture(scope="function")
 def welcome_screen(mobile_session: MobileSession) -> WelcomeScreen:
     return WelcomeScreen(mobile_session)
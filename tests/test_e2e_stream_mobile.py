@@ -13,6 +13,7 @@ from infra.mobile.mobile_session import MobileSession
 @pytest.mark.e2e
 @pytest.mark.streaming
 @pytest.mark.mobile
+@pytest.mark.usefixtures("normal_network")
 def test_e2e_login_and_stream_quality_degradation(
     streaming_validator: StreamingValidator,
     mobile_session: MobileSession,
@@ -23,7 +24,6 @@ def test_e2e_login_and_stream_quality_degradation(
 ) -> None:
 
     # --- Streaming baseline ---
-    streaming_validator.set_network_condition("normal")
     normal_latency = streaming_validator.get_latency_ms()
     manifest = streaming_validator.get_manifest()
     assert "#EXTM3U" in manifest
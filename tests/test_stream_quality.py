@@ -1,14 +1,18 @@
 from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
+import requests
 
+from config.config import StreamingConfig
 from infra.streaming.streaming_validator import StreamingValidator
 
 
 @pytest.mark.streaming
+@pytest.mark.usefixtures("normal_network")
 def test_stream_latency_degrades_from_normal_to_poor(
     streaming_validator: StreamingValidator,
 ) -> None:
-    streaming_validator.set_network_condition("normal")
     normal_latency = streaming_validator.get_latency_ms()
 
     streaming_validator.set_network_condition("poor")
@@ -18,31 +22,152 @@ def test_stream_latency_degrades_from_normal_to_poor(
 
 
 @pytest.mark.streaming
-@pytest.mark.parametrize("condition", ["normal", "poor", "terrible"])
-def test_manifest_available_under_all_conditions(
+@pytest.mark.parametrize(
+    ("condition", "expected_bitrate"),
+    [("normal", 2500), ("poor", 1200), ("terrible", 500)],
+)
+def test_set_network_condition_returns_applied_bitrate(
     streaming_validator: StreamingValidator,
     condition: str,
+    expected_bitrate: int,
+) -> None:
+    assert streaming_validator.set_network_condition(condition) == expected_bitrate
+
+
+@pytest.mark.streaming
+def test_set_network_condition_falls_back_to_json_endpoint(
+    streaming_validator: StreamingValidator,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    original_post = streaming_validator._post
+
+    def path_endpoint_down(path: str, **kwargs) -> requests.Response:
+        if path == "/control/network/poor":
+            raise requests.ConnectionError("path endpoint unavailable")
+        return original_post(path, **kwargs)
+
+    monkeypatch.setattr(streaming_validator, "_post", path_endpoint_down)
+
+    assert streaming_validator.set_network_condition("poor") == 1200
+    assert streaming_validator.get_health()["network_condition"] == "poor"
+
+
+@pytest.mark.streaming
+@pytest.mark.parametrize(
+    "network_condition", ["normal", "poor", "terrible"], indirect=True
+)
+def test_manifest_available_under_all_conditions(
+    streaming_validator: StreamingValidator,
+    network_condition: str,
 ) -> None:
-    streaming_validator.set_network_condition(condition)
     manifest = streaming_validator.get_manifest()
     assert "#EXTM3U" in manifest
 
 
 @pytest.mark.streaming
+@pytest.mark.usefixtures("normal_network")
 def test_segments_reachable_under_normal_conditions(
     streaming_validator: StreamingValidator,
 ) -> None:
-    streaming_validator.set_network_condition("normal")
+    indexes = range(1, 6)
+    with ThreadPoolExecutor(max_workers=len(indexes)) as executor:
+        segments = list(executor.map(streaming_validator.get_segment, indexes))
 
-    for index in range(1, 6):
-        data = streaming_validator.get_segment(index)
+    for index, data in zip(indexes, segments):
         assert data, f"Segment {index} should not be empty"
 
 
 @pytest.mark.streaming
+@pytest.mark.usefixtures("normal_network")
 def test_invalid_segment_returns_error(streaming_validator: StreamingValidator) -> None:
+    with pytest.raises(requests.HTTPError) as exc_info:
+        streaming_validator.get_segment(999)
+
+    assert exc_info.value.response.status_code == 404
+
+
+@pytest.mark.streaming
+@pytest.mark.parametrize("path", ["/stream.m3u8", "/segment1.ts"])
+@pytest.mark.parametrize(
+    "if_none_match",
+    ["{etag}", "W/{etag}", '"stale", {etag}', "*"],
+    ids=["exact", "weak", "in-list", "wildcard"],
+)
+def test_revalidation_with_matching_etag_returns_not_modified(
+    http_session: requests.Session,
+    streaming_config: StreamingConfig,
+    path: str,
+    if_none_match: str,
+) -> None:
+    url = f"{streaming_config.base_url.rstrip('/')}{path}"
+    etag = http_session.get(url, timeout=streaming_config.timeout).headers["ETag"]
+
+    resp = http_session.get(
+        url,
+        headers={"If-None-Match": if_none_match.format(etag=etag)},
+        timeout=streaming_config.timeout,
+    )
 
-    streaming_validator.set_network_condition("normal")
+    assert resp.status_code == 304
+    assert resp.content == b""
 
-    with pytest.raises(Exception):
+
+@pytest.mark.streaming
+def test_http_errors_are_not_retried(
+    streaming_validator: StreamingValidator,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    calls = []
+    original_request = streaming_validator.session.request
+
+    def counting_request(*args, **kwargs) -> requests.Response:
+        calls.append(args)
+        return original_request(*args, **kwargs)
+
+    monkeypatch.setattr(streaming_validator.session, "request", counting_request)
+
+    with pytest.raises(requests.HTTPError):
         streaming_validator.get_segment(999)
+
+    assert len(calls) == 1
+
+
+@pytest.mark.streaming
+def test_connection_errors_are_retried_up_to_max_retries(
+    streaming_validator: StreamingValidator,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    calls = []
+
+    def refused(*args, **kwargs) -> requests.Response:
+        calls.append(args)
+        raise requests.ConnectionError("connection refused")
+
+    monkeypatch.setattr(streaming_validator.session, "request", refused)
+    monkeypatch.setattr("infra.http.http_client.time.sleep", lambda _: None)
+
+    with pytest.raises(requests.ConnectionError):
+        streaming_validator.get_health()
+
+    assert len(calls) == streaming_validator.max_retries
+
+
+@pytest.mark.streaming
+@pytest.mark.parametrize(
+    "body", [b"not json", b'["poor"]', b'{"condition": ["poor"]}'],
+    ids=["invalid-json", "non-object", "non-string-condition"],
+)
+def test_json_control_rejects_malformed_body(
+    http_session: requests.Session,
+    streaming_config: StreamingConfig,
+    body: bytes,
+) -> None:
+    resp = http_session.post(
+        f"{streaming_config.control_base_url}/",
+        data=body,
+        headers={"Content-Type": "application/json"},
+        timeout=streaming_config.timeout,
+    )
+
+    assert resp.status_code == 400
+    assert resp.json()["status"] == "error"